@@ -4,6 +4,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
+import io
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from tsdownsample import LTTBDownsampler
 
 # Page config
 st.set_page_config(
@@ -19,10 +26,22 @@ st.markdown("**Identify your best-performing products over the last 6 months**")
 # Sidebar for controls
 st.sidebar.header("Analysis Controls")
 
+# DataFrame arguments are not hashed by the cache; a fingerprint argument keys it instead
+UNHASHED_DATAFRAMES = {pd.DataFrame: lambda _: None}
+
+def fingerprint(df):
+    """Identify a DataFrame's contents - computed once at ingest, O(1) to hash afterwards"""
+    digest = hashlib.blake2b(digest_size=16)
+    # Column names and dtypes count too: the same values under other headers are different data
+    digest.update(repr(tuple(df.columns)).encode())
+    digest.update(repr(tuple(df.dtypes.astype(str))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
 # Sample data generator (replace with actual data connection)
 @st.cache_data
-def generate_sample_data():
-    """Generate realistic sample sales data"""
+def generate_sample_data(seed=None):
+    """Generate realistic sample sales data (pass a seed for reproducible data)"""
     # Create 6 months of daily data
     end_date = datetime.now()
     start_date = end_date - timedelta(days=180)
@@ -48,31 +67,62 @@ def generate_sample_data():
         "Snacks", "Personal Care", "Personal Care", "Home", "Home"
     ]
     
-    data = []
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
+    n_days, n_skus = len(date_range), len(skus)
+    sku_index = np.arange(n_skus)
+    rng = np.random.default_rng(seed)
     
-    for date in date_range:
-        for i, sku in enumerate(skus):
-            # Simulate realistic sales patterns
-            base_quantity = np.random.poisson(5 + i * 2)
-            weekend_boost = 1.3 if date.weekday() >= 5 else 1.0
-            seasonal_factor = 1 + 0.3 * np.sin((date.dayofyear / 365) * 2 * np.pi)
-            
-            quantity = int(base_quantity * weekend_boost * seasonal_factor)
-            unit_price = 10 + i * 3 + np.random.uniform(-2, 2)
-            
-            if quantity > 0:  # Only add records with sales
-                data.append({
-                    'date': date,
-                    'sku': sku,
-                    'product_name': product_names[i],
-                    'category': categories[i],
-                    'quantity_sold': quantity,
-                    'unit_price': round(unit_price, 2),
-                    'total_revenue': round(quantity * unit_price, 2)
-                })
+    # Simulate realistic sales patterns for every (date, SKU) pair at once
+    base_quantity = rng.poisson(lam=5 + sku_index * 2, size=(n_days, n_skus))
+    weekend_boost = np.where(date_range.weekday.values[:, None] >= 5, 1.3, 1.0)
+    seasonal_factor = 1 + 0.3 * np.sin((date_range.dayofyear.values[:, None] / 365) * 2 * np.pi)
     
-    return pd.DataFrame(data)
+    quantity = (base_quantity * weekend_boost * seasonal_factor).astype(np.int32)
+    unit_price = 10 + sku_index * 3 + rng.uniform(-2, 2, size=(n_days, n_skus))
+    
+    # Flatten the (n_days, n_skus) grid row-major and keep only records with sales
+    dates = np.repeat(date_range.values, n_skus)
+    sku_idx = np.tile(sku_index, n_days)
+    quantity = quantity.ravel()
+    unit_price = unit_price.ravel()
+    has_sales = quantity > 0
+    
+    return pd.DataFrame({
+        'date': dates[has_sales],
+        'sku': np.take(skus, sku_idx[has_sales]),
+        'product_name': np.take(product_names, sku_idx[has_sales]),
+        'category': np.take(categories, sku_idx[has_sales]),
+        'quantity_sold': quantity[has_sales],
+        'unit_price': np.round(unit_price[has_sales], 2),
+        'total_revenue': np.round(quantity[has_sales] * unit_price[has_sales], 2)
+    })
+
+# Prepare data
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def prepare_df(raw, fp):
+    """Cast sales data to compact dtypes, derive revenue and sort by date"""
+    df = raw.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    # Rows without a date can't be placed in the range filter or the trend
+    df = df.dropna(subset=['date'])
+    # Blank quantities count as no units sold rather than rejecting the file
+    df['quantity_sold'] = df['quantity_sold'].fillna(0).astype('int32')
+    # Money columns stay float64 so revenue sums keep cent precision
+    df['unit_price'] = df['unit_price'].astype('float64')
+    # Create total_revenue if it doesn't exist
+    if 'total_revenue' not in df.columns:
+        df['total_revenue'] = df['quantity_sold'] * df['unit_price']
+    df['total_revenue'] = df['total_revenue'].astype('float64')
+    # Add category if missing
+    if 'category' not in df.columns:
+        df['category'] = 'General'
+    # Low-cardinality labels are stored as integer codes
+    for col in ('sku', 'product_name', 'category'):
+        df[col] = df[col].astype('category')
+    # Sorted dates let the date-range filter slice instead of mask
+    df = df.sort_values('date', ignore_index=True)
+    df.attrs['fp'] = fp
+    return df
 
 # Load data
 @st.cache_data
@@ -80,62 +130,111 @@ def load_data():
     """Load sales data - replace with your data source"""
     # In production, replace this with:
     # return pd.read_sql("SELECT * FROM sales_data WHERE date >= CURRENT_DATE - INTERVAL '6 months'", connection)
-    return generate_sample_data()
+    raw = generate_sample_data()
+    return prepare_df(raw, fingerprint(raw))
+
+# Columns an uploaded file must provide
+EXPECTED_COLUMNS = ['date', 'sku', 'product_name', 'quantity_sold', 'unit_price']
+
+# Columns the analysis reads; anything else in an upload is dropped
+ANALYSIS_COLUMNS = EXPECTED_COLUMNS + ['category', 'total_revenue']
+
+# Parse uploaded CSVs straight into their final dtypes
+UPLOAD_DTYPES = {
+    'sku': 'category',
+    'product_name': 'category',
+    'category': 'category',
+    'unit_price': 'float64'
+}
+UPLOAD_ARROW_TYPES = {
+    'date': pa.timestamp('ns'),
+    'sku': pa.dictionary(pa.int32(), pa.string()),
+    'product_name': pa.dictionary(pa.int32(), pa.string()),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+    'quantity_sold': pa.int32(),
+    'unit_price': pa.float64()
+}
+
+def read_uploaded_csv(buffer):
+    """Read an uploaded CSV, retrying with different quoting if columns are missing"""
+    # PyArrow's multithreaded CSV reader, falling back to pandas if it can't parse the file
+    try:
+        # Only the columns the analysis reads are converted
+        convert_options = pa_csv.ConvertOptions(
+            column_types=UPLOAD_ARROW_TYPES,
+            include_columns=ANALYSIS_COLUMNS,
+            include_missing_columns=True
+        )
+        table = pa_csv.read_csv(buffer, convert_options=convert_options)
+        # Columns absent from the file come back all-null; drop them so the checks below see them as missing
+        table = table.select([name for name in table.column_names if table.column(name).null_count < table.num_rows])
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+    except pa.ArrowInvalid:
+        buffer.seek(0)
+        df = pd.read_csv(buffer, dtype=UPLOAD_DTYPES)
+    
+    # If we don't have the right columns, try reading with different quoting
+    if not all(col in df.columns for col in EXPECTED_COLUMNS):
+        # Reset file pointer and try with different quoting
+        buffer.seek(0)
+        df = pd.read_csv(buffer, quoting=1, dtype=UPLOAD_DTYPES)  # QUOTE_ALL
+        
+    # If still no luck, try without quotes
+    if not all(col in df.columns for col in EXPECTED_COLUMNS):
+        buffer.seek(0)
+        df = pd.read_csv(buffer, quotechar='"', skipinitialspace=True, dtype=UPLOAD_DTYPES)
+    
+    return df
+
+@st.cache_data
+def load_uploaded(file_bytes, file_ext):
+    """Parse an uploaded sales file - cached on its content so reruns skip parsing"""
+    buffer = io.BytesIO(file_bytes)
+    
+    # Columnar formats are already typed and load straight into pandas
+    if file_ext == 'feather':
+        df = pd.read_feather(buffer)
+    elif file_ext == 'parquet':
+        df = pd.read_parquet(buffer)
+    else:
+        df = read_uploaded_csv(buffer)
+    
+    df.attrs['fp'] = fingerprint(df)
+    return df
 
 # Data upload option
 st.sidebar.subheader("Data Source")
 data_source = st.sidebar.radio(
     "Choose data source:",
-    ["Use Sample Data", "Upload CSV File"]
+    ["Use Sample Data", "Upload Data File"]
 )
 
-if data_source == "Upload CSV File":
+if data_source == "Upload Data File":
     uploaded_file = st.sidebar.file_uploader(
-        "Upload your sales data CSV",
-        type=['csv'],
-        help="CSV should contain: date, sku, product_name, quantity_sold, unit_price"
+        "Upload your sales data file",
+        type=['csv', 'feather', 'parquet'],
+        help="File should contain: date, sku, product_name, quantity_sold, unit_price"
     )
     
     if uploaded_file is not None:
         try:
-            # Try to read the CSV with different parameters to handle various formats
-            df = pd.read_csv(uploaded_file)
-            
-            # Check if we have the expected columns
-            expected_columns = ['date', 'sku', 'product_name', 'quantity_sold', 'unit_price']
-            
-            # If we don't have the right columns, try reading with different quoting
-            if not all(col in df.columns for col in expected_columns):
-                # Reset file pointer and try with different quoting
-                uploaded_file.seek(0)
-                df = pd.read_csv(uploaded_file, quoting=1)  # QUOTE_ALL
-                
-            # If still no luck, try without quotes
-            if not all(col in df.columns for col in expected_columns):
-                uploaded_file.seek(0)
-                df = pd.read_csv(uploaded_file, quotechar='"', skipinitialspace=True)
+            df = load_uploaded(uploaded_file.getvalue(), uploaded_file.name.rsplit('.', 1)[-1].lower())
             
             # Check again and show helpful error if columns are still missing
-            missing_columns = [col for col in expected_columns if col not in df.columns]
+            missing_columns = [col for col in EXPECTED_COLUMNS if col not in df.columns]
             if missing_columns:
                 st.error(f"Missing required columns: {missing_columns}")
                 st.error(f"Found columns: {list(df.columns)}")
-                st.info("Please ensure your CSV has columns: date, sku, product_name, quantity_sold, unit_price")
+                st.info("Please ensure your file has columns: date, sku, product_name, quantity_sold, unit_price")
                 df = load_data()  # Fall back to sample data
             else:
                 # Process the uploaded data
-                df['date'] = pd.to_datetime(df['date'])
-                # Create total_revenue if it doesn't exist
-                if 'total_revenue' not in df.columns:
-                    df['total_revenue'] = df['quantity_sold'] * df['unit_price']
-                # Add category if missing
-                if 'category' not in df.columns:
-                    df['category'] = 'General'
+                df = prepare_df(df, df.attrs['fp'])
                 st.success("✅ Data uploaded successfully!")
                 
         except Exception as e:
-            st.error(f"Error reading CSV file: {str(e)}")
-            st.info("Using sample data instead. Please check your CSV format.")
+            st.error(f"Error reading file: {str(e)}")
+            st.info("Using sample data instead. Please check your file format.")
             df = load_data()
     else:
         df = load_data()
@@ -151,59 +250,90 @@ metric = st.sidebar.selectbox(
 )
 
 # Date range filter
+def date_bounds(df):
+    """First and last date in the data - O(1) since prepare_df sorts by date"""
+    return df['date'].iloc[0].date(), df['date'].iloc[-1].date()
+
+min_date, max_date = date_bounds(df)
 date_range = st.sidebar.date_input(
     "Date Range",
-    value=(df['date'].min().date(), df['date'].max().date()),
-    min_value=df['date'].min().date(),
-    max_value=df['date'].max().date()
+    value=(min_date, max_date),
+    min_value=min_date,
+    max_value=max_date
 )
 
 # Filter data by date range
 if len(date_range) == 2:
     start_date, end_date = date_range
-    df_filtered = df[(df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)]
+    # Bounds take the column's timezone so tz-aware uploads compare cleanly
+    tz = df['date'].dt.tz
+    lo = pd.Timestamp(start_date).tz_localize(tz)
+    hi = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).tz_localize(tz)
+    # Data is sorted by date at ingest, so the range is a binary-searched slice
+    df_filtered = df.iloc[df['date'].searchsorted(lo):df['date'].searchsorted(hi)]
+    filtered_fp = f"{df.attrs['fp']}:{lo.date()}:{hi.date()}"
 else:
     df_filtered = df
+    filtered_fp = df.attrs['fp']
+
+# Sort column for each primary metric
+METRIC_COLUMNS = {
+    "Total Revenue": 'total_revenue',
+    "Quantity Sold": 'total_quantity',
+    "Average Order Value": 'avg_order_value'
+}
 
 # Calculate key metrics
-@st.cache_data
-def calculate_sku_metrics(df):
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def calculate_sku_metrics(df, fp):
     """Calculate key performance metrics for each SKU"""
-    sku_metrics = df.groupby(['sku', 'product_name', 'category']).agg({
-        'quantity_sold': 'sum',
-        'total_revenue': 'sum',
-        'unit_price': 'mean',
-        'date': 'nunique'  # Days with sales
-    }).reset_index()
+    # Polars runs the groupby multi-threaded on Arrow-backed columns
+    transactions = pl.from_pandas(df).lazy()
+    # product_name and category depend on sku, so group on sku alone and join them back
+    lookup = transactions.select(['sku', 'product_name', 'category']).unique(subset='sku', keep='first')
+    sku_metrics = transactions.group_by('sku').agg([
+        # quantity_sold is int32 at ingest; sum in 64-bit so large totals don't wrap
+        pl.col('quantity_sold').cast(pl.Int64).sum().alias('total_quantity'),
+        pl.col('total_revenue').sum().alias('total_revenue'),
+        pl.col('unit_price').mean().alias('avg_unit_price'),
+        # Days with sales: rows arrive sorted by date, so count date changes instead of hashing dates
+        ((pl.col('date') != pl.col('date').shift(1)).sum() + 1).alias('days_with_sales')
+    ]).with_columns([
+        # Calculate additional metrics
+        (pl.col('total_quantity') / pl.col('days_with_sales')).alias('avg_daily_quantity'),
+        (pl.col('total_revenue') / pl.col('total_quantity')).alias('avg_order_value')
+    ])
+    # Sort by sku so ties at the top-N cutoff resolve the same way on every run
+    sku_metrics = lookup.join(sku_metrics, on='sku').sort(pl.col('sku').cast(pl.String)).collect()
     
-    sku_metrics.columns = ['sku', 'product_name', 'category', 'total_quantity', 
-                          'total_revenue', 'avg_unit_price', 'days_with_sales']
-    
-    # Calculate additional metrics
-    sku_metrics['avg_daily_quantity'] = sku_metrics['total_quantity'] / sku_metrics['days_with_sales']
-    sku_metrics['avg_order_value'] = sku_metrics['total_revenue'] / sku_metrics['total_quantity']
-    
-    return sku_metrics
+    # Hand a pandas frame back to the Streamlit layer
+    return sku_metrics.to_pandas()
 
-sku_metrics = calculate_sku_metrics(df_filtered)
+sku_metrics = calculate_sku_metrics(df_filtered, filtered_fp)
 
-# Sort by selected metric
-if metric == "Total Revenue":
-    sku_metrics_sorted = sku_metrics.sort_values('total_revenue', ascending=False)
-elif metric == "Quantity Sold":
-    sku_metrics_sorted = sku_metrics.sort_values('total_quantity', ascending=False)
-else:  # Average Order Value
-    sku_metrics_sorted = sku_metrics.sort_values('avg_order_value', ascending=False)
+# Rank by selected metric
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def top_skus_by_metric(sku_metrics, fp, metric, top_n):
+    """Top N SKUs by the column behind the selected metric"""
+    # Partial sort: only the top N rows need ordering
+    return sku_metrics.nlargest(top_n, METRIC_COLUMNS[metric])
+
+top_skus = top_skus_by_metric(sku_metrics, filtered_fp, metric, top_n)
 
 # Main dashboard
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def calculate_totals(df, fp):
+    """Total revenue and units sold, reduced in a single aggregation"""
+    totals = df.agg({'total_revenue': 'sum', 'quantity_sold': 'sum'})
+    return float(totals['total_revenue']), int(totals['quantity_sold'])
+
+total_revenue, total_quantity = calculate_totals(df_filtered, filtered_fp)
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    total_revenue = df_filtered['total_revenue'].sum()
     st.metric("Total Revenue", f"${total_revenue:,.2f}")
 
 with col2:
-    total_quantity = df_filtered['quantity_sold'].sum()
     st.metric("Total Units Sold", f"{total_quantity:,}")
 
 with col3:
@@ -214,19 +344,71 @@ with col3:
 st.header(f"Top {top_n} SKUs by {metric}")
 
 # Display top SKUs table
-top_skus = sku_metrics_sorted.head(top_n)
+# Formatting happens in the browser, so the data itself is left unrounded
 st.dataframe(
-    top_skus[['sku', 'product_name', 'category', 'total_quantity', 'total_revenue', 'avg_order_value']].round(2),
-    use_container_width=True
+    top_skus[['sku', 'product_name', 'category', 'total_quantity', 'total_revenue', 'avg_order_value']],
+    use_container_width=True,
+    column_config={
+        'total_revenue': st.column_config.NumberColumn(format='$%.2f'),
+        'avg_order_value': st.column_config.NumberColumn(format='$%.2f'),
+        'total_quantity': st.column_config.NumberColumn(format='%d')
+    }
 )
 
+# Category performance
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def calculate_category_metrics(sku_metrics, fp):
+    """Roll SKU metrics up to revenue and units sold per category"""
+    return sku_metrics.groupby('category', as_index=False, observed=True)[['total_revenue', 'total_quantity']].sum()
+
+category_metrics = calculate_category_metrics(sku_metrics, filtered_fp)
+
+# Time series analysis
+# Roll up to weekly buckets when there are too many transactions to plot daily
+TREND_RESAMPLE_THRESHOLD = 10_000
+
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def calculate_daily_sales(df, fp, freq='D'):
+    """Aggregate revenue and units sold per period (daily by default)"""
+    return df.set_index('date').resample(freq)[['total_revenue', 'quantity_sold']].sum().reset_index()
+
+trend_freq, trend_label = ('D', 'Daily') if len(df_filtered) < TREND_RESAMPLE_THRESHOLD else ('W', 'Weekly')
+daily_sales = calculate_daily_sales(df_filtered, filtered_fp, trend_freq)
+
+# Cap the number of points sent to the browser for long, fine-grained series;
+# at this size the SVG line renders fine, so no WebGL trace is needed
+MAX_TREND_POINTS = 2000
+
+@st.cache_data(hash_funcs=UNHASHED_DATAFRAMES)
+def downsample_trend(daily_sales, fp, n_out=MAX_TREND_POINTS):
+    """Downsample the revenue trend with LTTB, keeping its visual shape"""
+    if len(daily_sales) <= n_out:
+        return daily_sales
+    idx = LTTBDownsampler().downsample(
+        daily_sales['date'].values.astype('i8'),
+        daily_sales['total_revenue'].values,
+        n_out=n_out
+    )
+    return daily_sales.iloc[idx]
+
+trend_points = downsample_trend(daily_sales, filtered_fp)
+
 # Visualizations
-col1, col2 = st.columns(2)
+def chart_data(df, columns):
+    """Keep only the plotted columns, with numbers as float32 and labels as categories"""
+    data = df[columns]
+    return data.astype({
+        col: 'float32' if pd.api.types.is_numeric_dtype(data[col]) else 'category'
+        for col in columns
+        if not pd.api.types.is_datetime64_any_dtype(data[col])
+    })
 
-with col1:
+# The figures share no data, so build them concurrently
+with ThreadPoolExecutor(max_workers=4) as executor:
     # Revenue chart
-    fig_revenue = px.bar(
-        top_skus, 
+    future_revenue = executor.submit(
+        px.bar,
+        chart_data(top_skus, ['sku', 'total_revenue']),
         x='sku', 
         y='total_revenue',
         title=f'Top {top_n} SKUs by Revenue',
@@ -234,13 +416,10 @@ with col1:
         color='total_revenue',
         color_continuous_scale='Blues'
     )
-    fig_revenue.update_layout(showlegend=False, xaxis_tickangle=-45)
-    st.plotly_chart(fig_revenue, use_container_width=True)
-
-with col2:
     # Quantity chart
-    fig_quantity = px.bar(
-        top_skus, 
+    future_quantity = executor.submit(
+        px.bar,
+        chart_data(top_skus, ['sku', 'total_quantity']),
         x='sku', 
         y='total_quantity',
         title=f'Top {top_n} SKUs by Quantity Sold',
@@ -248,38 +427,45 @@ with col2:
         color='total_quantity',
         color_continuous_scale='Greens'
     )
-    fig_quantity.update_layout(showlegend=False, xaxis_tickangle=-45)
+    # Category chart
+    future_category = executor.submit(
+        px.pie,
+        chart_data(category_metrics, ['category', 'total_revenue']),
+        values='total_revenue',
+        names='category',
+        title='Revenue Distribution by Category'
+    )
+    # Trend chart
+    future_trend = executor.submit(
+        px.line,
+        chart_data(trend_points, ['date', 'total_revenue']),
+        x='date',
+        y='total_revenue',
+        title=f'{trend_label} Revenue Trend',
+        labels={'total_revenue': f'{trend_label} Revenue ($)', 'date': 'Date'}
+    )
+
+fig_revenue, fig_quantity, fig_category, fig_trend = (
+    future.result() for future in (future_revenue, future_quantity, future_category, future_trend)
+)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    fig_revenue.update_layout(showlegend=False, xaxis_tickangle=-45, uirevision='static')
+    st.plotly_chart(fig_revenue, use_container_width=True)
+
+with col2:
+    fig_quantity.update_layout(showlegend=False, xaxis_tickangle=-45, uirevision='static')
     st.plotly_chart(fig_quantity, use_container_width=True)
 
-# Category performance
 st.header("Performance by Category")
-category_metrics = df_filtered.groupby('category').agg({
-    'total_revenue': 'sum',
-    'quantity_sold': 'sum'
-}).reset_index()
-
-fig_category = px.pie(
-    category_metrics,
-    values='total_revenue',
-    names='category',
-    title='Revenue Distribution by Category'
-)
+fig_category.update_layout(uirevision='static')
 st.plotly_chart(fig_category, use_container_width=True)
 
-# Time series analysis
 st.header("Sales Trends Over Time")
-daily_sales = df_filtered.groupby('date').agg({
-    'total_revenue': 'sum',
-    'quantity_sold': 'sum'
-}).reset_index()
-
-fig_trend = px.line(
-    daily_sales,
-    x='date',
-    y='total_revenue',
-    title='Daily Revenue Trend',
-    labels={'total_revenue': 'Daily Revenue ($)', 'date': 'Date'}
-)
+fig_trend.update_traces(mode='lines')
+fig_trend.update_layout(hovermode='x unified', spikedistance=-1, dragmode='pan', uirevision='static')
 st.plotly_chart(fig_trend, use_container_width=True)
 
 # AI Insights section
@@ -321,6 +507,16 @@ if st.button("Download Top SKU Analysis"):
         file_name=f"top_skus_analysis_{datetime.now().strftime('%Y%m%d')}.csv",
         mime="text/csv"
     )
+    
+    # Feather keeps column types and compresses well for repeat analysis
+    feather_buffer = io.BytesIO()
+    top_skus.reset_index(drop=True).to_feather(feather_buffer, compression='zstd')
+    st.download_button(
+        label="Download Feather",
+        data=feather_buffer.getvalue(),
+        file_name=f"top_skus_analysis_{datetime.now().strftime('%Y%m%d')}.feather",
+        mime="application/octet-stream"
+    )
 
 # Footer
 st.markdown("---")